@@ -111,9 +111,9 @@ class HIDMacropadController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.set_mute(True)
                             results[ip] = success
@@ -141,9 +141,9 @@ class HIDMacropadController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.set_mute(False)
                             results[ip] = success
@@ -171,9 +171,9 @@ class HIDMacropadController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.freeze_screen(True)
                             results[ip] = success
@@ -201,9 +201,9 @@ class HIDMacropadController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.freeze_screen(False)
                             results[ip] = success
@@ -246,9 +246,9 @@ class HIDMacropadController:
             front_ips = self.get_front_projectors()
             # Check current state of first front projector
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             status = controller.get_status()
                             if status.get('mute') == 'MUTED':
@@ -271,9 +271,9 @@ class HIDMacropadController:
             front_ips = self.get_front_projectors()
             # Check current state of first front projector
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             status = controller.get_status()
                             if status.get('freeze') == 'FROZEN':
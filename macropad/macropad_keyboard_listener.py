@@ -123,9 +123,9 @@ class MacropadKeyboardListener:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.set_mute(True)
                             results[ip] = success
@@ -150,9 +150,9 @@ class MacropadKeyboardListener:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.set_mute(False)
                             results[ip] = success
@@ -177,9 +177,9 @@ class MacropadKeyboardListener:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.freeze_screen(True)
                             results[ip] = success
@@ -204,9 +204,9 @@ class MacropadKeyboardListener:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.freeze_screen(False)
                             results[ip] = success
@@ -120,9 +120,9 @@ class MacropadServiceController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.set_mute(True)
                             results[ip] = success
@@ -147,9 +147,9 @@ class MacropadServiceController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.set_mute(False)
                             results[ip] = success
@@ -174,9 +174,9 @@ class MacropadServiceController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.freeze_screen(True)
                             results[ip] = success
@@ -201,9 +201,9 @@ class MacropadServiceController:
             front_ips = self.get_front_projectors()
             results = {}
             for ip in front_ips:
-                if ip in self.manager.controllers:
+                controller = self.manager.get_controller(ip)
+                if controller:
                     try:
-                        controller = self.manager.controllers[ip]
                         with controller:
                             success = controller.freeze_screen(False)
                             results[ip] = success
@@ -2,80 +2,112 @@
 """
 USB Keypad Configuration for Sony Projector Control
 Supports various 4-button USB keypads including Cut/Copy/Paste keypads
+
+Key mappings are built lazily: pynput pulls in a platform backend (Xlib
+on Linux, Quartz on macOS) the moment Key/KeyCode are touched, which is
+wasted startup time for scripts that import this module but read keys
+via evdev instead.
 """
 
-from pynput.keyboard import Key, KeyCode
+import functools
 
 # Button function definitions
 BUTTON_FUNCTIONS = {
     1: "Turn projectors OFF",
-    2: "Turn projectors ON", 
+    2: "Turn projectors ON",
     3: "Toggle screen blanking",
     4: "Toggle screen freezing"
 }
 
-# Keypad configurations for different USB keypads
-KEYPAD_CONFIGS = {
-    # Standard 4-button keypad (Ctrl, C, V, Enter)
-    "standard": {
+
+# Builder per keypad type - pynput is only imported when one is called
+def _standard():
+    """Standard 4-button keypad (Ctrl, C, V, Enter)"""
+    from pynput.keyboard import Key, KeyCode
+    return {
         Key.ctrl: 1,        # Ctrl key - Turn projectors OFF
         KeyCode.from_char('c'): 2,  # C key - Turn projectors ON
         KeyCode.from_char('v'): 3,  # V key - Toggle screen blanking
         Key.enter: 4,       # Enter key - Toggle screen freezing
-    },
-    
-    # Cut/Copy/Paste keypad (Ctrl+X, Ctrl+C, Ctrl+V, Enter)
-    "cut_copy_paste": {
+    }
+
+
+def _cut_copy_paste():
+    """Cut/Copy/Paste keypad (Ctrl+X, Ctrl+C, Ctrl+V, Enter)"""
+    from pynput.keyboard import Key, KeyCode
+    return {
         KeyCode.from_char('x'): 1,  # Cut (Ctrl+X) - Turn projectors OFF
         KeyCode.from_char('c'): 2,  # Copy (Ctrl+C) - Turn projectors ON
         KeyCode.from_char('v'): 3,  # Paste (Ctrl+V) - Toggle screen blanking
         Key.enter: 4,       # Enter key - Toggle screen freezing
-    },
-    
-    # Alternative Cut/Copy/Paste keypad (if keys are different)
-    "cut_copy_paste_alt": {
+    }
+
+
+def _cut_copy_paste_alt():
+    """Alternative Cut/Copy/Paste keypad (if keys are different)"""
+    from pynput.keyboard import KeyCode
+    return {
         KeyCode.from_char('x'): 1,  # Cut key - Turn projectors OFF
         KeyCode.from_char('c'): 2,  # Copy key - Turn projectors ON
         KeyCode.from_char('v'): 3,  # Paste key - Toggle screen blanking
         KeyCode.from_char('z'): 4,  # Undo key - Toggle screen freezing
-    },
-    
-    # Function key keypad (F1, F2, F3, F4)
-    "function_keys": {
+    }
+
+
+def _function_keys():
+    """Function key keypad (F1, F2, F3, F4)"""
+    from pynput.keyboard import Key
+    return {
         Key.f1: 1,          # F1 - Turn projectors OFF
         Key.f2: 2,          # F2 - Turn projectors ON
         Key.f3: 3,          # F3 - Toggle screen blanking
         Key.f4: 4,          # F4 - Toggle screen freezing
-    },
-    
-    # Number keypad (1, 2, 3, 4)
-    "number_keys": {
+    }
+
+
+def _number_keys():
+    """Number keypad (1, 2, 3, 4)"""
+    from pynput.keyboard import KeyCode
+    return {
         KeyCode.from_char('1'): 1,  # 1 - Turn projectors OFF
         KeyCode.from_char('2'): 2,  # 2 - Turn projectors ON
         KeyCode.from_char('3'): 3,  # 3 - Toggle screen blanking
         KeyCode.from_char('4'): 4,  # 4 - Toggle screen freezing
     }
+
+
+KEYPAD_CONFIG_BUILDERS = {
+    "standard": _standard,
+    "cut_copy_paste": _cut_copy_paste,
+    "cut_copy_paste_alt": _cut_copy_paste_alt,
+    "function_keys": _function_keys,
+    "number_keys": _number_keys,
 }
 
+
+@functools.cache
 def get_keypad_config(keypad_type="cut_copy_paste"):
     """
     Get keypad configuration for specified type
-    
+
     Args:
         keypad_type (str): Type of keypad to use
-        
+
     Returns:
         dict: Key mappings for the keypad
     """
-    return KEYPAD_CONFIGS.get(keypad_type, KEYPAD_CONFIGS["cut_copy_paste"])
+    builder = KEYPAD_CONFIG_BUILDERS.get(keypad_type, _cut_copy_paste)
+    return builder()
+
 
 def list_available_configs():
     """List all available keypad configurations"""
     print("Available keypad configurations:")
-    for config_name, config in KEYPAD_CONFIGS.items():
+    for config_name in KEYPAD_CONFIG_BUILDERS:
         print(f"\n{config_name}:")
-        for key, button in config.items():
+        for key, button in get_keypad_config(config_name).items():
             print(f"  {key} → Button {button}: {BUTTON_FUNCTIONS[button]}")
 
+
 if __name__ == "__main__":
     list_available_configs()
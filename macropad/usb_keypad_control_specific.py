@@ -4,16 +4,19 @@ Specific USB Keypad Control for Sony Projector System
 Targets a specific USB device to avoid keyboard interference
 """
 
+import atexit
 import time
 import threading
 import os
+import select
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 import logging
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from projector_control import ProjectorManager, ProjectorController
+from projector_control import ProjectorManager, ProjectorController, MuteState, FreezeState
 
 # Try to import evdev for direct USB input
 try:
@@ -24,13 +27,55 @@ except ImportError:
     EVDEV_AVAILABLE = False
     print("❌ evdev not available - install with: sudo apt install python3-evdev")
 
+# Where the last successfully used keypad device is remembered between runs,
+# so startup can skip the full /dev/input/event* capability scan
+_KEYPAD_CACHE_FILE = os.path.expanduser("~/.cache/sony-projector/keypad_path")
+
+
+def _configure_logging(debug_mode: bool):
+    """One-time logging setup shared by every controller instance
+
+    Calling logging.basicConfig with handlers= from __init__ re-opened the
+    log file and stacked a duplicate handler pair on the root logger per
+    instance; guard on existing handlers so setup happens exactly once.
+    """
+    if logging.getLogger().handlers:
+        return
+    logging.basicConfig(
+        level=logging.INFO if debug_mode else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('usb_keypad_control_specific.log'),
+            logging.StreamHandler()
+        ]
+    )
+
 class SpecificUSBKeypadController:
     """USB keypad controller targeting a specific device"""
-    
+
+    # How long a cached status result stays fresh - rapid successive
+    # button presses reuse it instead of re-querying every projector
+    STATUS_CACHE_TTL = 0.25
+
+    # Presses of the same button within this window are dropped so key
+    # bounce / evdev auto-repeat can't trigger a storm of PJLink fan-outs
+    DEBOUNCE_NS = 300_000_000
+
     def __init__(self, projectors: list, device_path: str = None, debug_mode: bool = True):
         self.projectors = projectors
         self.device_path = device_path
         self.debug_mode = debug_mode
+        self._status_cache = {}
+        self._last_press_ns = [0] * 5  # indexed by button number (1-4)
+
+        # Single long-lived worker for button actions: the event loop hands
+        # an action off and goes straight back to draining key events, and
+        # one worker means actions can never race each other. The manager's
+        # own pool still fans each action out across projectors.
+        self._action_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="keypad-action"
+        )
+        atexit.register(self._action_pool.shutdown, wait=False)
         
         # Convert config format to expected format, filtering out rear projector for freeze operations
         # Rear projector (10.10.10.4) doesn't support freeze functionality
@@ -80,16 +125,29 @@ class SpecificUSBKeypadController:
             3: self.toggle_mute,           # Button 3: Toggle screen blank
             4: self.toggle_freeze,         # Button 4: Toggle freeze
         }
-        
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO if debug_mode else logging.WARNING,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('usb_keypad_control_specific.log'),
-                logging.StreamHandler()
-            ]
-        )
+
+        # Key names for exactly the mapped codes - one small dict.get in
+        # debug prints instead of two probes into the ~700-entry ecodes.KEY
+        self._key_names = {}
+        if EVDEV_AVAILABLE:
+            self._key_names = {
+                code: ecodes.KEY.get(code, f"Key_{code}")
+                for code in self.key_mappings
+            }
+
+        # Flat array indexed by evdev key code - a single list index on the
+        # hot path instead of key->button->function->action dict lookups
+        self._keycode_to_action = [None] * 256
+        for key_code, button_num in self.key_mappings.items():
+            if key_code < 256:
+                self._keycode_to_action[key_code] = (
+                    button_num,
+                    self.button_functions[button_num],
+                    self.button_actions[button_num],
+                )
+
+        # Setup logging (no-op after the first instance)
+        _configure_logging(debug_mode)
         self.logger = logging.getLogger(__name__)
         
     def list_input_devices(self):
@@ -113,11 +171,46 @@ class SpecificUSBKeypadController:
             print(f"❌ Error listing devices: {e}")
             return []
             
+    def _load_cached_keypad(self):
+        """Reopen the keypad cached from a previous run, if still valid"""
+        try:
+            with open(_KEYPAD_CACHE_FILE) as f:
+                path, _, name = f.read().partition("\n")
+        except OSError:
+            return None
+
+        if not path or not os.path.exists(path):
+            return None
+
+        try:
+            device = InputDevice(path)
+        except Exception:
+            return None
+
+        # Only trust the cache if the same device is still at that path
+        if name.strip() and device.name != name.strip():
+            device.close()
+            return None
+
+        print(f"✅ Using cached keypad: {device.name} at {path}")
+        return device
+
+    def _save_cached_keypad(self, device):
+        """Remember the chosen keypad for the next run (atomic replace)"""
+        try:
+            os.makedirs(os.path.dirname(_KEYPAD_CACHE_FILE), exist_ok=True)
+            tmp_path = _KEYPAD_CACHE_FILE + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(f"{device.path}\n{device.name}\n")
+            os.replace(tmp_path, _KEYPAD_CACHE_FILE)
+        except OSError as e:
+            self.logger.debug("Could not cache keypad path: %s", e)
+
     def find_usb_keypad(self):
         """Find USB keypad device, excluding keyboards"""
         if not EVDEV_AVAILABLE:
             return None
-            
+
         try:
             # If specific device path provided, use it
             if self.device_path:
@@ -128,73 +221,116 @@ class SpecificUSBKeypadController:
                 else:
                     print(f"❌ Specified device not found: {self.device_path}")
                     return None
-            
-            # Look for input devices, excluding keyboards
-            devices = [InputDevice(path) for path in evdev.list_devices()]
-            
-            for device in devices:
+
+            # Fast path: the device found on a previous run
+            device = self._load_cached_keypad()
+            if device:
+                return device
+
+            # Full scan: probe devices one at a time and stop at the first
+            # match instead of opening every input node up front
+            for path in evdev.list_devices():
+                device = InputDevice(path)
+
                 # Skip keyboard devices
                 if 'keyboard' in device.name.lower():
+                    device.close()
                     continue
-                    
+
                 # Check if it's a keypad-like device
-                if ('keypad' in device.name.lower() or 
+                if ('keypad' in device.name.lower() or
                     'macro' in device.name.lower() or
                     'usb' in device.name.lower()):
                     print(f"✅ Found potential keypad: {device.name} at {device.path}")
+                    self._save_cached_keypad(device)
                     return device
-                    
+
                 # Check capabilities for key events (but not keyboard)
                 if ecodes.EV_KEY in device.capabilities():
                     # Skip if it looks like a full keyboard
                     key_codes = device.capabilities()[ecodes.EV_KEY]
                     if len(key_codes) < 20:  # Keypads typically have fewer keys
                         print(f"✅ Found potential keypad: {device.name} at {device.path}")
+                        self._save_cached_keypad(device)
                         return device
-                    
+
+                device.close()
+
             print("❌ No USB keypad found")
             return None
-            
+
         except Exception as e:
             print(f"❌ Error finding USB keypad: {e}")
             return None
             
     def handle_key_event(self, event):
         """Handle key press events"""
-        if event.type == ecodes.EV_KEY and event.value == 1:  # Key press
-            key_code = event.code
-            
-            if self.debug_mode:
-                print(f"\n🔑 Key pressed: {key_code} ({ecodes.KEY[event.code] if event.code in ecodes.KEY else 'Unknown'})")
-            
-            # Map key to button number
-            button_num = self.key_mappings.get(key_code)
-            
-            if button_num:
-                self.handle_button_press(button_num, key_code)
-            else:
-                if self.debug_mode:
-                    print(f"   ⚠️  Unknown key code: {key_code}")
-                    print(f"   Available key codes: {list(self.key_mappings.keys())}")
-                    
+        if event.type != ecodes.EV_KEY or event.value != 1:  # Key press only
+            return
+
+        key_code = event.code
+        entry = self._keycode_to_action[key_code] if key_code < 256 else None
+
+        if not self.debug_mode:
+            # Fast path: no per-press string formatting when debug is off
+            if entry is not None:
+                self._execute_entry(entry, key_code)
+            return
+
+        print(f"\n🔑 Key pressed: {key_code} ({self._key_names.get(key_code, 'Unknown')})")
+        if entry is not None:
+            self._execute_entry(entry, key_code)
+        else:
+            print(f"   ⚠️  Unknown key code: {key_code}")
+            print(f"   Available key codes: {list(self.key_mappings.keys())}")
+
+    def _dispatch(self, key_code: int):
+        """Look up and queue the action for a pressed key (fast path)"""
+        entry = self._keycode_to_action[key_code] if key_code < 256 else None
+        if entry is not None:
+            self._execute_entry(entry, key_code)
+
     def handle_button_press(self, button_num: int, key_code: int = 0):
         """Handle button press and execute action"""
+        action = self.button_actions.get(button_num)
+        if not action:
+            print(f"   ❌ No action defined for button {button_num}")
+            return
+        self._execute_entry((button_num, self.button_functions[button_num], action), key_code)
+
+    def _execute_entry(self, entry, key_code: int = 0):
+        """Queue a precomputed (button, function name, action) entry"""
+        button_num, func_name, action = entry
+
+        # Debounce: one physical press, one action
+        now = time.monotonic_ns()
+        if now - self._last_press_ns[button_num] < self.DEBOUNCE_NS:
+            if self.debug_mode:
+                print(f"   ⏳ Debounced repeat of button {button_num}")
+            return
+        self._last_press_ns[button_num] = now
+
+        # Run off the event thread so key events keep flowing while the
+        # PJLink round-trips happen
+        self._action_pool.submit(self._run_action, button_num, func_name,
+                                 action, key_code)
+
+    def _run_action(self, button_num: int, func_name: str, action, key_code: int):
+        """Execute one button action on the worker thread"""
         try:
-            print(f"\n🎯 BUTTON {button_num} ACTIVATED!")
-            print(f"   Function: {self.button_functions[button_num]}")
-            print(f"   Key code: {key_code}")
-            print(f"   Time: {time.strftime('%H:%M:%S')}")
-            
-            # Execute the button action
-            action = self.button_actions.get(button_num)
-            if action:
-                action()
-            else:
-                print(f"   ❌ No action defined for button {button_num}")
-                
+            # The banner (including the strftime call) is debug-only; the
+            # actions print their own user-facing progress lines
+            if self.debug_mode:
+                print(f"\n🎯 BUTTON {button_num} ACTIVATED!")
+                print(f"   Function: {func_name}")
+                print(f"   Key code: {key_code}")
+                print(f"   Time: {time.strftime('%H:%M:%S')}")
+
+            action()
+
         except Exception as e:
             print(f"   ❌ Error executing button {button_num}: {e}")
-            self.logger.error(f"Button {button_num} error: {e}")
+            self.logger.error("Button %s error: %s", button_num, e)
             
     def power_on_all(self):
         """Turn on all projectors"""
@@ -209,7 +345,7 @@ class SpecificUSBKeypadController:
                 print(f"❌ Failed to turn on {total_count - success_count} of {total_count} projectors")
         except Exception as e:
             print(f"❌ Error turning on projectors: {e}")
-            self.logger.error(f"Power on error: {e}")
+            self.logger.error("Power on error: %s", e)
             
     def power_off_all(self):
         """Turn off all projectors"""
@@ -224,30 +360,39 @@ class SpecificUSBKeypadController:
                 print(f"❌ Failed to turn off {total_count - success_count} of {total_count} projectors")
         except Exception as e:
             print(f"❌ Error turning off projectors: {e}")
-            self.logger.error(f"Power off error: {e}")
+            self.logger.error("Power off error: %s", e)
             
+    def _cached_status(self, kind: str, fetch):
+        """Return a recent cached status result, or fetch and cache one"""
+        cached = self._status_cache.get(kind)
+        if cached and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+            return cached[1]
+        result = fetch()
+        self._status_cache[kind] = (time.monotonic(), result)
+        return result
+
     def toggle_mute(self):
         """Toggle screen blank/unblank"""
         print("🎬 Toggling screen mute...")
         try:
-            # Get current status and toggle
-            status = self.manager.get_all_status()
+            # Get current mute status (one query per projector) and toggle
+            status = self._cached_status('mute', self.manager.get_all_mute_status)
             current_mute = None
-            
-            # Check if all projectors have the same mute status
-            mute_statuses = []
-            for projector_status in status.values():
-                if 'mute' in projector_status:
-                    mute_statuses.append(projector_status['mute'])
-            
-            if mute_statuses:
-                # If all projectors have the same mute status, toggle it
-                if len(set(mute_statuses)) == 1:
-                    current_mute = mute_statuses[0] == 'MUTED'
+
+            # Fold statuses into a bitmask of small ints - a single set bit
+            # means every projector agrees, no set()/string hashing needed
+            bitmask = 0
+            for value in status.values():
+                bitmask |= 1 << MuteState.from_status(value)
+
+            if bitmask:
+                if bitmask & (bitmask - 1) == 0:
+                    # All projectors have the same mute status - toggle it
+                    current_mute = bitmask == 1 << MuteState.MUTED
                 else:
                     # Mixed status - force to unmute
                     current_mute = False
-            
+
             # Toggle based on current status
             if current_mute:
                 results = self.manager.mute_all(False)
@@ -255,7 +400,8 @@ class SpecificUSBKeypadController:
             else:
                 results = self.manager.mute_all(True)
                 action = "muted"
-                
+            self._status_cache.pop('mute', None)
+
             success_count = sum(1 for success in results.values() if success)
             total_count = len(results)
             if success_count == total_count:
@@ -265,30 +411,29 @@ class SpecificUSBKeypadController:
                 
         except Exception as e:
             print(f"❌ Error toggling mute: {e}")
-            self.logger.error(f"Mute toggle error: {e}")
+            self.logger.error("Mute toggle error: %s", e)
             
     def toggle_freeze(self):
         """Toggle freeze (pause/resume video)"""
         print("⏸️  Toggling freeze...")
         try:
-            # Get current status and toggle
-            status = self.manager.get_all_status()
+            # Get current freeze status (one query per projector) and toggle
+            status = self._cached_status('freeze', self.manager.get_all_freeze_status)
             current_freeze = None
-            
-            # Check if all projectors have the same freeze status
-            freeze_statuses = []
-            for projector_status in status.values():
-                if 'freeze' in projector_status:
-                    freeze_statuses.append(projector_status['freeze'])
-            
-            if freeze_statuses:
-                # If all projectors have the same freeze status, toggle it
-                if len(set(freeze_statuses)) == 1:
-                    current_freeze = freeze_statuses[0] == 'FROZEN'
+
+            # Same bitmask trick as toggle_mute: single set bit = uniform state
+            bitmask = 0
+            for value in status.values():
+                bitmask |= 1 << FreezeState.from_status(value)
+
+            if bitmask:
+                if bitmask & (bitmask - 1) == 0:
+                    # All projectors have the same freeze status - toggle it
+                    current_freeze = bitmask == 1 << FreezeState.FROZEN
                 else:
                     # Mixed status - force to unfreeze
                     current_freeze = False
-            
+
             # Toggle based on current status
             if current_freeze:
                 results = self.manager.freeze_all_screens(False)
@@ -296,7 +441,8 @@ class SpecificUSBKeypadController:
             else:
                 results = self.manager.freeze_all_screens(True)
                 action = "frozen"
-                
+            self._status_cache.pop('freeze', None)
+
             success_count = sum(1 for success in results.values() if success)
             total_count = len(results)
             if success_count == total_count:
@@ -306,7 +452,7 @@ class SpecificUSBKeypadController:
                 
         except Exception as e:
             print(f"❌ Error toggling freeze: {e}")
-            self.logger.error(f"Freeze toggle error: {e}")
+            self.logger.error("Freeze toggle error: %s", e)
             
     def run(self):
         """Start the specific USB keypad listener"""
@@ -320,7 +466,7 @@ class SpecificUSBKeypadController:
         print(f"   Debug mode: {self.debug_mode}")
         print("\nButton mappings:")
         for key_code, button in self.key_mappings.items():
-            key_name = ecodes.KEY[key_code] if key_code in ecodes.KEY else f"Key_{key_code}"
+            key_name = self._key_names.get(key_code, f"Key_{key_code}")
             print(f"   {key_name} ({key_code}) → Button {button}: {self.button_functions[button]}")
         print("\nPress buttons on your USB keypad to control projectors!")
         print("Press Ctrl+C to exit\n")
@@ -337,27 +483,65 @@ class SpecificUSBKeypadController:
             return
             
         self.running = True
-        
+        poller = None
+
         try:
-            # Read events from the device
-            for event in device.read_loop():
-                if not self.running:
-                    break
-                    
-                self.handle_key_event(event)
-                
+            # Grab device to prevent other programs from reading it
+            try:
+                device.grab()
+            except Exception as e:
+                self.logger.warning("Could not grab %s: %s", device.path, e)
+
+            # Non-blocking fd + epoll: one wakeup drains every queued
+            # event instead of paying a read() syscall per event.
+            # EPOLLEXCLUSIVE (Linux >= 4.5) means that if another evdev
+            # consumer also waits on this device, only one waiter is woken
+            # per event instead of all of them; older kernels fall back to
+            # a plain EPOLLIN registration.
+            os.set_blocking(device.fd, False)
+            poller = select.epoll()
+            poller.register(device.fd,
+                            select.EPOLLIN | getattr(select, 'EPOLLEXCLUSIVE', 0))
+
+            while self.running:
+                if not poller.poll(timeout=1.0):
+                    continue
+                try:
+                    if self.debug_mode:
+                        for event in device.read():
+                            self.handle_key_event(event)
+                    else:
+                        # EV_KEY == 1 is kernel ABI; testing inline skips a
+                        # method call for the EV_SYN/EV_MSC events that
+                        # accompany every keypress
+                        for event in device.read():
+                            if event.type == 1 and event.value == 1:
+                                self._dispatch(event.code)
+                except BlockingIOError:
+                    continue
+
         except KeyboardInterrupt:
             print("\n🛑 Keyboard interrupt - stopping...")
             self.running = False
         except Exception as e:
             print(f"❌ Error reading from device: {e}")
-            self.logger.error(f"Device read error: {e}")
+            self.logger.error("Device read error: %s", e)
         finally:
+            if poller is not None:
+                try:
+                    poller.close()
+                except:
+                    pass
+            try:
+                device.ungrab()
+            except:
+                pass
             self.cleanup()
             
     def cleanup(self):
         """Cleanup resources"""
         self.running = False
+        self._action_pool.shutdown(wait=False)
         self.manager.close()
 
 def main():
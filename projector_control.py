@@ -4,11 +4,13 @@ Sony VPL-PHZ61 Projector Control Application
 Controls multiple projectors via PJLink protocol
 """
 
+import enum
 import socket
 import time
 import threading
 import os
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
 # Ensure logs directory exists
@@ -17,6 +19,52 @@ os.makedirs('logs', exist_ok=True)
 # Module-level logger (safe to create at import time)
 logger = logging.getLogger(__name__)
 
+# Precomputed PJLink command frames - the per-press hot path sends these
+# as-is instead of formatting and encoding a string per call
+_CMD_POWR_QUERY = b"%1POWR ?\r"
+_CMD_POWR_ON = b"%1POWR 1\r"
+_CMD_POWR_OFF = b"%1POWR 0\r"
+_CMD_AVMT_QUERY = b"%1AVMT ?\r"
+_CMD_AVMT_MUTE = b"%1AVMT 31\r"
+_CMD_AVMT_UNMUTE = b"%1AVMT 30\r"
+_CMD_FREZ_QUERY = b"%2FREZ ?\r"
+_CMD_FREZ_ON = b"%2FREZ 1\r"
+_CMD_FREZ_OFF = b"%2FREZ 0\r"
+_CMD_LAMP_QUERY = b"%1LAMP ?\r"
+
+
+class MuteState(enum.IntEnum):
+    """Mute status as small ints for cheap same/mixed checks in toggles"""
+    UNMUTED = 0
+    MUTED = 1
+    UNKNOWN = 2
+
+    @classmethod
+    def from_status(cls, status: Optional[str]) -> "MuteState":
+        """Map a get_mute_status() string (or None) to a MuteState"""
+        if status == "MUTED":
+            return cls.MUTED
+        if status == "UNMUTED":
+            return cls.UNMUTED
+        return cls.UNKNOWN
+
+
+class FreezeState(enum.IntEnum):
+    """Freeze status as small ints for cheap same/mixed checks in toggles"""
+    NORMAL = 0
+    FROZEN = 1
+    UNKNOWN = 2
+
+    @classmethod
+    def from_status(cls, status: Optional[str]) -> "FreezeState":
+        """Map a get_freeze_status() string (or None) to a FreezeState"""
+        if status == "FROZEN":
+            return cls.FROZEN
+        if status == "NORMAL":
+            return cls.NORMAL
+        return cls.UNKNOWN
+
+
 class ProjectorController:
     """Controls Sony VPL-PHZ61 projectors via PJLink protocol"""
     
@@ -43,6 +91,9 @@ class ProjectorController:
                 
                 self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.socket.settimeout(self.timeout)
+                # PJLink packets are tiny - disable Nagle so commands go out
+                # immediately instead of waiting for a delayed ACK
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 self.socket.connect((self.ip, self.port))
                 
                 # Read initial connection message
@@ -64,32 +115,46 @@ class ProjectorController:
                     pass
                 self.socket = None
                 
-    def send_command(self, command: str) -> Optional[str]:
-        """Send PJLink command and return response"""
+    def send_command(self, command) -> Optional[str]:
+        """Send PJLink command (str or precomputed bytes) and return response
+
+        The connection is persistent: one socket is reused across commands
+        to avoid a TCP handshake per query. If the projector dropped an
+        idle connection, the command is retried once on a fresh socket.
+        """
         if not self.socket:
             if not self.connect():
                 return None
-                
-        try:
-            with self.lock:
-                # Send command
-                self.socket.sendall(command.encode('ascii'))
-                logger.debug(f"Sent to {self.ip}: {command.strip()}")
-                
-                # Receive response
-                response = self.socket.recv(1024).decode('ascii', errors='ignore')
-                logger.debug(f"Received from {self.ip}: {response.strip()}")
-                return response.strip()
-                
-        except Exception as e:
-            logger.error(f"Command failed on {self.ip}: {e}")
-            # Try to reconnect
-            self.connect()
-            return None
+
+        payload = command if isinstance(command, bytes) else command.encode('ascii')
+
+        for attempt in (1, 2):
+            try:
+                with self.lock:
+                    # Send command
+                    self.socket.sendall(payload)
+                    logger.debug(f"Sent to {self.ip}: {payload.strip()}")
+
+                    # Receive response (empty read = peer closed the socket)
+                    data = self.socket.recv(1024)
+                    if not data:
+                        raise ConnectionError("Connection closed by projector")
+                    response = data.decode('ascii', errors='ignore')
+                    logger.debug(f"Received from {self.ip}: {response.strip()}")
+                    return response.strip()
+
+            except Exception as e:
+                if attempt == 2:
+                    logger.error(f"Command failed on {self.ip}: {e}")
+                    return None
+                logger.debug(f"Reconnecting to {self.ip} after error: {e}")
+                if not self.connect():
+                    return None
+        return None
             
     def get_power_status(self) -> Optional[str]:
         """Get projector power status"""
-        response = self.send_command("%1POWR ?\r")
+        response = self.send_command(_CMD_POWR_QUERY)
         if response:
             if response == "%1POWR=0":
                 return "OFF"
@@ -103,13 +168,13 @@ class ProjectorController:
         
     def set_power(self, power_on: bool) -> bool:
         """Turn projector on/off"""
-        command = "%1POWR 1\r" if power_on else "%1POWR 0\r"
+        command = _CMD_POWR_ON if power_on else _CMD_POWR_OFF
         response = self.send_command(command)
         return response == "%1POWR=OK"
         
     def get_mute_status(self) -> Optional[str]:
         """Get audio/video mute status"""
-        response = self.send_command("%1AVMT ?\r")
+        response = self.send_command(_CMD_AVMT_QUERY)
         if response:
             if response == "%1AVMT=30":
                 return "UNMUTED"
@@ -119,14 +184,13 @@ class ProjectorController:
         
     def set_mute(self, mute: bool) -> bool:
         """Mute/unmute audio and video"""
-        command = "%1AVMT 31\r" if mute else "%1AVMT 30\r"
+        command = _CMD_AVMT_MUTE if mute else _CMD_AVMT_UNMUTE
         response = self.send_command(command)
         return response == "%1AVMT=OK"
         
     def free_screen(self) -> bool:
         """Free the screen (unmute/clear any blanking)"""
-        command = "%1AVMT 30\r"  # Unmute video and audio
-        response = self.send_command(command)
+        response = self.send_command(_CMD_AVMT_UNMUTE)  # Unmute video and audio
         return response == "%1AVMT=OK"
         
     def freeze_screen(self, freeze: bool) -> bool:
@@ -134,8 +198,7 @@ class ProjectorController:
         if freeze:
             # Use the correct PJLink freeze command: %2FREZ 1
             logger.info(f"Attempting to freeze screen for {self.ip} using FREZ command")
-            command = "%2FREZ 1\r"
-            response = self.send_command(command)
+            response = self.send_command(_CMD_FREZ_ON)
             if response == "%2FREZ=OK":
                 logger.info(f"Freeze command successful for {self.ip}")
                 return True
@@ -145,8 +208,7 @@ class ProjectorController:
         else:
             # Unfreeze using %2FREZ 0
             logger.info(f"Attempting to unfreeze screen for {self.ip}")
-            command = "%2FREZ 0\r"
-            response = self.send_command(command)
+            response = self.send_command(_CMD_FREZ_OFF)
             if response == "%2FREZ=OK":
                 logger.info(f"Unfreeze command successful for {self.ip}")
                 return True
@@ -156,7 +218,7 @@ class ProjectorController:
         
     def get_freeze_status(self) -> Optional[str]:
         """Get freeze status using correct PJLink FREZ command"""
-        response = self.send_command("%2FREZ ?\r")
+        response = self.send_command(_CMD_FREZ_QUERY)
         logger.info(f"Freeze status response from {self.ip}: {response}")
         
         if response:
@@ -201,7 +263,7 @@ class ProjectorController:
         
     def get_lamp_hours(self) -> Optional[int]:
         """Get lamp hours (if supported)"""
-        response = self.send_command("%1LAMP ?\r")
+        response = self.send_command(_CMD_LAMP_QUERY)
         if response and response.startswith("%1LAMP="):
             try:
                 # Parse lamp hours from response
@@ -216,112 +278,154 @@ class ProjectorManager:
     """Manages multiple projectors"""
     
     def __init__(self, projectors: List[Tuple[str, int]], aliases: dict = None):
+        # Keyed by "ip:port" so multiple projectors on the same IP (e.g.
+        # mock servers in tests) don't silently overwrite each other
         self.controllers = {
-            ip: ProjectorController(ip, port) 
+            f"{ip}:{port}": ProjectorController(ip, port)
             for ip, port in projectors
         }
         self.aliases = aliases or {}
         self.nickname_to_ip = {nickname: ip for ip, nickname in self.aliases.items()}
-        
+        # Shared pool for fanning commands out to all projectors at once -
+        # each controller has its own socket and lock, so per-projector
+        # round-trips can overlap instead of serializing
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(4, len(self.controllers)),
+            thread_name_prefix="pjlink"
+        )
+
+    def _fan_out(self, work: Callable) -> Dict[str, object]:
+        """Run work(ip, controller) for every projector concurrently"""
+        futures = {
+            self._pool.submit(work, ip, controller): ip
+            for ip, controller in self.controllers.items()
+        }
+        results = {}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+        return results
+
     def get_projector_by_nickname(self, nickname: str) -> Optional[str]:
         """Get projector IP by nickname"""
         return self.nickname_to_ip.get(nickname.lower())
         
     def get_nickname_by_ip(self, ip: str) -> Optional[str]:
-        """Get nickname by projector IP"""
+        """Get nickname by projector IP (accepts bare IP or 'ip:port' key)"""
+        ip = ip.split(':', 1)[0]
         for nickname, projector_ip in self.nickname_to_ip.items():
             if projector_ip == ip:
                 return nickname
         return None
+
+    def get_controller(self, ip: str) -> Optional[ProjectorController]:
+        """Look up a controller by 'ip:port' key or bare IP"""
+        controller = self.controllers.get(ip)
+        if controller:
+            return controller
+        for candidate in self.controllers.values():
+            if candidate.ip == ip:
+                return candidate
+        return None
         
     def get_all_status(self) -> Dict[str, Dict]:
-        """Get status of all projectors"""
-        status = {}
-        for ip, controller in self.controllers.items():
+        """Get status of all projectors (queried concurrently)"""
+        def query(ip, controller):
             try:
-                with controller:
-                    power = controller.get_power_status()
-                    mute = controller.get_mute_status()
-                    freeze = controller.get_freeze_status()
-                    lamp_hours = controller.get_lamp_hours()
-                    
-                    status[ip] = {
-                        'power': power,
-                        'mute': mute,
-                        'freeze': freeze,
-                        'lamp_hours': lamp_hours,
-                        'online': power is not None
-                    }
+                power = controller.get_power_status()
+                mute = controller.get_mute_status()
+                freeze = controller.get_freeze_status()
+                lamp_hours = controller.get_lamp_hours()
+
+                return {
+                    'power': power,
+                    'mute': mute,
+                    'freeze': freeze,
+                    'lamp_hours': lamp_hours,
+                    'online': power is not None
+                }
             except Exception as e:
                 logger.error(f"Failed to get status from {ip}: {e}")
-                status[ip] = {
+                return {
                     'power': None,
                     'mute': None,
                     'freeze': None,
                     'lamp_hours': None,
                     'online': False
                 }
-        return status
-        
+        return self._fan_out(query)
+
+    def get_all_mute_status(self) -> Dict[str, Optional[str]]:
+        """Get only the mute status of all projectors (one query each)"""
+        def query(ip, controller):
+            try:
+                return controller.get_mute_status()
+            except Exception as e:
+                logger.error(f"Failed to get mute status from {ip}: {e}")
+                return None
+        return self._fan_out(query)
+
+    def get_all_freeze_status(self) -> Dict[str, Optional[str]]:
+        """Get only the freeze status of all projectors (one query each)"""
+        def query(ip, controller):
+            try:
+                return controller.get_freeze_status()
+            except Exception as e:
+                logger.error(f"Failed to get freeze status from {ip}: {e}")
+                return None
+        return self._fan_out(query)
+
     def power_all(self, power_on: bool) -> Dict[str, bool]:
         """Turn all projectors on/off"""
-        results = {}
-        for ip, controller in self.controllers.items():
+        def set_power(ip, controller):
             try:
-                with controller:
-                    success = controller.set_power(power_on)
-                    results[ip] = success
-                    logger.info(f"{ip}: Power {'ON' if power_on else 'OFF'} {'successful' if success else 'failed'}")
+                success = controller.set_power(power_on)
+                logger.info(f"{ip}: Power {'ON' if power_on else 'OFF'} {'successful' if success else 'failed'}")
+                return success
             except Exception as e:
                 logger.error(f"Failed to control power on {ip}: {e}")
-                results[ip] = False
-        return results
-        
+                return False
+        return self._fan_out(set_power)
+
     def mute_all(self, mute: bool) -> Dict[str, bool]:
         """Mute/unmute all projectors"""
-        results = {}
-        for ip, controller in self.controllers.items():
+        def set_mute(ip, controller):
             try:
-                with controller:
-                    success = controller.set_mute(mute)
-                    results[ip] = success
-                    logger.info(f"{ip}: {'Mute' if mute else 'Unmute'} {'successful' if success else 'failed'}")
+                success = controller.set_mute(mute)
+                logger.info(f"{ip}: {'Mute' if mute else 'Unmute'} {'successful' if success else 'failed'}")
+                return success
             except Exception as e:
                 logger.error(f"Failed to control mute on {ip}: {e}")
-                results[ip] = False
-        return results
-        
+                return False
+        return self._fan_out(set_mute)
+
     def free_all_screens(self) -> Dict[str, bool]:
         """Free all screens (unmute/clear blanking)"""
-        results = {}
-        for ip, controller in self.controllers.items():
+        def free_screen(ip, controller):
             try:
-                with controller:
-                    success = controller.free_screen()
-                    results[ip] = success
-                    logger.info(f"{ip}: Free screen {'successful' if success else 'failed'}")
+                success = controller.free_screen()
+                logger.info(f"{ip}: Free screen {'successful' if success else 'failed'}")
+                return success
             except Exception as e:
                 logger.error(f"Failed to free screen on {ip}: {e}")
-                results[ip] = False
-        return results
-        
+                return False
+        return self._fan_out(free_screen)
+
     def freeze_all_screens(self, freeze: bool) -> Dict[str, bool]:
         """Freeze/unfreeze all screens"""
-        results = {}
-        for ip, controller in self.controllers.items():
+        def freeze_screen(ip, controller):
             try:
-                with controller:
-                    success = controller.freeze_screen(freeze)
-                    results[ip] = success
-                    action = "Freeze" if freeze else "Unfreeze"
-                    logger.info(f"{ip}: {action} screen {'successful' if success else 'failed'}")
+                success = controller.freeze_screen(freeze)
+                action = "Freeze" if freeze else "Unfreeze"
+                logger.info(f"{ip}: {action} screen {'successful' if success else 'failed'}")
+                return success
             except Exception as e:
                 logger.error(f"Failed to freeze screen on {ip}: {e}")
-                results[ip] = False
-        return results
-        
+                return False
+        return self._fan_out(freeze_screen)
+
     def close(self):
         """Close all connections"""
+        self._pool.shutdown(wait=False)
         for controller in self.controllers.values():
             controller.disconnect()
 
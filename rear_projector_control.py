@@ -4,6 +4,7 @@ Rear Projector Control Script
 Controls the rear projector (10.10.10.4) independently from front projectors
 """
 
+import asyncio
 import socket
 import time
 import threading
@@ -17,6 +18,12 @@ os.makedirs('logs', exist_ok=True)
 # Module-level logger (safe to create at import time)
 logger = logging.getLogger(__name__)
 
+# All six status queries pipelined into a single send - PJLink accepts
+# multiple commands per TCP session, so get_status() needs one round-trip
+# instead of six
+STATUS_QUERIES = b"%1POWR ?\r%1AVMT ?\r%2FREZ ?\r%1LAMP ?\r%1INPT ?\r%1ERST ?\r"
+STATUS_QUERY_COUNT = 6
+
 class RearProjectorController:
     """Controls the rear projector via PJLink protocol"""
     
@@ -26,7 +33,11 @@ class RearProjectorController:
         self.timeout = timeout
         self.socket = None
         self.lock = threading.Lock()
-        
+        # Async connection state (see connect_async/send_command_async)
+        self._reader = None
+        self._writer = None
+        self._alock = None
+
     def __enter__(self):
         self.connect()
         return self
@@ -87,9 +98,9 @@ class RearProjectorController:
             self.connect()
             return None
             
-    def get_power_status(self) -> Optional[str]:
-        """Get rear projector power status"""
-        response = self.send_command("%1POWR ?\r")
+    @staticmethod
+    def _parse_power(response: Optional[str]) -> Optional[str]:
+        """Parse a %1POWR query response"""
         if response:
             if response == "%1POWR=0":
                 return "OFF"
@@ -100,7 +111,38 @@ class RearProjectorController:
             elif response == "%1POWR=3":
                 return "WARMING"
         return None
-        
+
+    @staticmethod
+    def _parse_mute(response: Optional[str]) -> Optional[str]:
+        """Parse a %1AVMT query response"""
+        if response:
+            if response == "%1AVMT=30":
+                return "UNMUTED"
+            elif response == "%1AVMT=31":
+                return "MUTED"
+        return None
+
+    @staticmethod
+    def _parse_freeze(response: Optional[str]) -> Optional[str]:
+        """Parse a %2FREZ query response"""
+        if response:
+            if response == "%2FREZ=0":
+                return "NORMAL"
+            elif response == "%2FREZ=1":
+                return "FROZEN"
+        return None
+
+    @staticmethod
+    def _parse_prefixed(response: Optional[str], prefix: str) -> Optional[str]:
+        """Strip a PJLink response prefix (e.g. '%1LAMP=') from a response"""
+        if response and response.startswith(prefix):
+            return response.replace(prefix, "")
+        return None
+
+    def get_power_status(self) -> Optional[str]:
+        """Get rear projector power status"""
+        return self._parse_power(self.send_command("%1POWR ?\r"))
+
     def set_power(self, power_on: bool) -> bool:
         """Turn rear projector on/off"""
         command = "%1POWR 1\r" if power_on else "%1POWR 0\r"
@@ -109,14 +151,8 @@ class RearProjectorController:
         
     def get_mute_status(self) -> Optional[str]:
         """Get rear projector audio/video mute status"""
-        response = self.send_command("%1AVMT ?\r")
-        if response:
-            if response == "%1AVMT=30":
-                return "UNMUTED"
-            elif response == "%1AVMT=31":
-                return "MUTED"
-        return None
-        
+        return self._parse_mute(self.send_command("%1AVMT ?\r"))
+
     def set_mute(self, mute: bool) -> bool:
         """Mute/unmute rear projector audio and video"""
         command = "%1AVMT 31\r" if mute else "%1AVMT 30\r"
@@ -156,48 +192,155 @@ class RearProjectorController:
         """Get rear projector freeze status using correct PJLink FREZ command"""
         response = self.send_command("%2FREZ ?\r")
         logger.info(f"Freeze status response from rear projector: {response}")
-        
-        if response:
-            if response == "%2FREZ=0":
-                return "NORMAL"
-            elif response == "%2FREZ=1":
-                return "FROZEN"
-        return None
-        
+        return self._parse_freeze(response)
+
     def get_lamp_hours(self) -> Optional[str]:
         """Get rear projector lamp hours"""
-        response = self.send_command("%1LAMP ?\r")
-        if response and response.startswith("%1LAMP="):
-            return response.replace("%1LAMP=", "")
-        return None
-        
+        return self._parse_prefixed(self.send_command("%1LAMP ?\r"), "%1LAMP=")
+
     def get_input_status(self) -> Optional[str]:
         """Get rear projector input status"""
-        response = self.send_command("%1INPT ?\r")
-        if response and response.startswith("%1INPT="):
-            return response.replace("%1INPT=", "")
-        return None
-        
+        return self._parse_prefixed(self.send_command("%1INPT ?\r"), "%1INPT=")
+
     def get_error_status(self) -> Optional[str]:
         """Get rear projector error status"""
-        response = self.send_command("%1ERST ?\r")
-        if response and response.startswith("%1ERST="):
-            return response.replace("%1ERST=", "")
-        return None
-        
+        return self._parse_prefixed(self.send_command("%1ERST ?\r"), "%1ERST=")
+
+    async def connect_async(self) -> bool:
+        """Establish an asyncio connection to the rear projector"""
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.ip, self.port), self.timeout)
+
+            # Read initial connection message
+            initial_msg = await asyncio.wait_for(self._reader.read(1024), self.timeout)
+            logger.info(f"Connected to rear projector {self.ip}: "
+                        f"{initial_msg.decode('ascii', errors='ignore').strip()}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to connect to rear projector {self.ip}: {e}")
+            self._reader = None
+            self._writer = None
+            return False
+
+    async def disconnect_async(self):
+        """Close the asyncio connection to the rear projector"""
+        if self._writer:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._reader = None
+            self._writer = None
+
+    async def send_command_async(self, command: str) -> Optional[str]:
+        """Send PJLink command over the asyncio connection and return response"""
+        if self._alock is None:
+            self._alock = asyncio.Lock()
+
+        # The lock serializes concurrent queries (e.g. asyncio.gather) onto
+        # the single shared connection
+        async with self._alock:
+            if self._writer is None:
+                if not await self.connect_async():
+                    return None
+
+            try:
+                self._writer.write(command.encode('ascii'))
+                await self._writer.drain()
+                logger.debug(f"Sent to rear projector {self.ip}: {command.strip()}")
+
+                response = await asyncio.wait_for(self._reader.read(1024), self.timeout)
+                decoded = response.decode('ascii', errors='ignore').strip()
+                logger.debug(f"Received from rear projector {self.ip}: {decoded}")
+                return decoded
+
+            except Exception as e:
+                logger.error(f"Command failed on rear projector {self.ip}: {e}")
+                return None
+
+    async def get_power_status_async(self) -> Optional[str]:
+        """Get rear projector power status (async)"""
+        return self._parse_power(await self.send_command_async("%1POWR ?\r"))
+
+    async def get_mute_status_async(self) -> Optional[str]:
+        """Get rear projector audio/video mute status (async)"""
+        return self._parse_mute(await self.send_command_async("%1AVMT ?\r"))
+
+    async def get_freeze_status_async(self) -> Optional[str]:
+        """Get rear projector freeze status (async)"""
+        return self._parse_freeze(await self.send_command_async("%2FREZ ?\r"))
+
+    async def get_lamp_hours_async(self) -> Optional[str]:
+        """Get rear projector lamp hours (async)"""
+        return self._parse_prefixed(await self.send_command_async("%1LAMP ?\r"), "%1LAMP=")
+
+    async def get_input_status_async(self) -> Optional[str]:
+        """Get rear projector input status (async)"""
+        return self._parse_prefixed(await self.send_command_async("%1INPT ?\r"), "%1INPT=")
+
+    async def get_error_status_async(self) -> Optional[str]:
+        """Get rear projector error status (async)"""
+        return self._parse_prefixed(await self.send_command_async("%1ERST ?\r"), "%1ERST=")
+
     def get_status(self) -> dict:
-        """Get comprehensive status of rear projector"""
+        """Get comprehensive status of rear projector (one pipelined round-trip)"""
         try:
             with self:
-                return {
-                    'power': self.get_power_status(),
-                    'mute': self.get_mute_status(),
-                    'freeze': self.get_freeze_status(),
-                    'lamp_hours': self.get_lamp_hours(),
-                    'input': self.get_input_status(),
-                    'error': self.get_error_status(),
+                with self.lock:
+                    # Send all queries at once and read back the
+                    # \r-terminated responses in order
+                    self.socket.sendall(STATUS_QUERIES)
+                    buffer = b""
+                    while buffer.count(b"\r") < STATUS_QUERY_COUNT:
+                        chunk = self.socket.recv(1024)
+                        if not chunk:
+                            break
+                        buffer += chunk
+
+                status = {
+                    'power': None,
+                    'mute': None,
+                    'freeze': None,
+                    'lamp_hours': None,
+                    'input': None,
+                    'error': None,
                     'online': True
                 }
+
+                for frame in buffer.split(b"\r"):
+                    response = frame.decode('ascii', errors='ignore').strip()
+                    if not response:
+                        continue
+                    if response.startswith("%1POWR="):
+                        if response == "%1POWR=0":
+                            status['power'] = "OFF"
+                        elif response == "%1POWR=1":
+                            status['power'] = "ON"
+                        elif response == "%1POWR=2":
+                            status['power'] = "COOLING"
+                        elif response == "%1POWR=3":
+                            status['power'] = "WARMING"
+                    elif response.startswith("%1AVMT="):
+                        if response == "%1AVMT=30":
+                            status['mute'] = "UNMUTED"
+                        elif response == "%1AVMT=31":
+                            status['mute'] = "MUTED"
+                    elif response.startswith("%2FREZ="):
+                        if response == "%2FREZ=0":
+                            status['freeze'] = "NORMAL"
+                        elif response == "%2FREZ=1":
+                            status['freeze'] = "FROZEN"
+                    elif response.startswith("%1LAMP="):
+                        status['lamp_hours'] = response.replace("%1LAMP=", "")
+                    elif response.startswith("%1INPT="):
+                        status['input'] = response.replace("%1INPT=", "")
+                    elif response.startswith("%1ERST="):
+                        status['error'] = response.replace("%1ERST=", "")
+
+                return status
         except Exception as e:
             logger.error(f"Failed to get rear projector status: {e}")
             return {
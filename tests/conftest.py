@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Shared pytest setup for the mock projector test suite
+"""
+
+import os
+import sys
+
+# Put the project root on sys.path exactly once, at collection time.
+# Individual test modules only insert it themselves (guarded) so they can
+# still be run directly with `python tests/<file>.py`.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
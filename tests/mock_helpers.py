@@ -15,7 +15,9 @@ except ImportError:
     # Fall back to absolute import (when run directly)
     import sys
     import os
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    _TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+    if _TESTS_DIR not in sys.path:
+        sys.path.insert(0, _TESTS_DIR)
     from mock_projector_server import MockProjectorServer, MockProjectorState
 
 
@@ -57,10 +59,8 @@ def mock_projector_server(host: str = "127.0.0.1", port: int = 0, **state_kwargs
         server.set_state(**state_kwargs)
     
     try:
-        port = server.start()
-        # Give server a moment to start
-        import time
-        time.sleep(0.1)
+        server.start()
+        server.wait_ready()
         yield server
     finally:
         server.stop()
@@ -100,7 +100,11 @@ def create_mock_socket_patcher(responses: Dict[str, str], initial_message: str =
             
         def settimeout(self, timeout):
             pass
-            
+
+        def setsockopt(self, level, optname, value):
+            pass
+
+
         def sendall(self, data):
             if not self.connected:
                 raise Exception("Not connected")
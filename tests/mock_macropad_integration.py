@@ -6,13 +6,15 @@ Allows testing macropad functionality without real projectors
 
 import sys
 import os
-import time
 import unittest.mock
 from contextlib import contextmanager
 from typing import List, Tuple, Dict
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports (skipped when already present,
+# e.g. when pytest's conftest.py has set it up for the whole session)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from mock_projector_server import MockProjectorServer
 from mock_helpers import mock_projector_server
@@ -54,10 +56,10 @@ class MockMacropadEnvironment:
             port = server.start()
             self.servers.append(server)
             self.mock_projectors.append(("127.0.0.1", port))
-            
-        # Give servers time to start
-        time.sleep(0.2)
-        
+
+        for server in self.servers:
+            server.wait_ready()
+
         return self.mock_projectors
     
     def stop(self):
@@ -68,23 +70,16 @@ class MockMacropadEnvironment:
         self.mock_projectors = []
     
     def get_server(self, index: int = 0) -> MockProjectorServer:
-        """Get a specific mock server by index"""
-        if 0 <= index < len(self.servers):
-            return self.servers[index]
-        return None
-    
+        """Get a specific mock server by index (raises IndexError if out of range)"""
+        return self.servers[index]
+
     def set_state(self, index: int, **state):
         """Set state for a specific projector"""
-        server = self.get_server(index)
-        if server:
-            server.set_state(**state)
-    
+        self.servers[index].set_state(**state)
+
     def get_state(self, index: int) -> Dict:
         """Get state for a specific projector"""
-        server = self.get_server(index)
-        if server:
-            return server.get_state()
-        return {}
+        return self.servers[index].get_state()
 
 
 @contextmanager
@@ -4,15 +4,45 @@ Mock PJLink Projector Server
 Simulates a Sony projector for testing without hardware
 """
 
+import concurrent.futures
+import functools
 import socket
 import threading
-import time
 from typing import Dict, Optional
 
 
+@functools.lru_cache(maxsize=None)
+def _build_query_table(power: str, mute: str, freeze: str,
+                       lamp_hours: int, input_source: str, error: str) -> Dict[str, str]:
+    """
+    Build the query-command -> response table for one state tuple.
+
+    Memoized so repeated queries against an unchanged state cost a single
+    dict lookup instead of re-running the per-query string formatting.
+    """
+    power_map = {
+        "OFF": "%1POWR=0",
+        "ON": "%1POWR=1",
+        "COOLING": "%1POWR=2",
+        "WARMING": "%1POWR=3"
+    }
+    return {
+        "%1POWR ?": power_map.get(power, "%1POWR=0"),
+        "%1AVMT ?": "%1AVMT=31" if mute == "MUTED" else "%1AVMT=30",
+        "%2FREZ ?": "%2FREZ=1" if freeze == "FROZEN" else "%2FREZ=0",
+        "%1LAMP ?": f"%1LAMP=1 {lamp_hours} 1",
+        "%1INPT ?": f"%1INPT={input_source}",
+        "%1ERST ?": f"%1ERST={error}"
+    }
+
+
 class MockProjectorState:
     """Represents the state of a mock projector"""
-    
+
+    # Fixed field set - __slots__ drops the per-instance __dict__ and makes
+    # the hot attribute reads in _process_command direct offset loads
+    __slots__ = ('power', 'mute', 'freeze', 'lamp_hours', 'input', 'error')
+
     def __init__(self):
         self.power = "OFF"  # OFF, ON, COOLING, WARMING
         self.mute = "UNMUTED"  # MUTED, UNMUTED
@@ -69,12 +99,21 @@ class MockProjectorServer:
         self.running = False
         self.state = MockProjectorState()
         self.initial_message = "PJLink 1\r\n"
-        
+        self._pool = None
+        self._ready = threading.Event()
+        self._state_lock = threading.Lock()
+
     def start(self) -> int:
         """Start the mock server and return the port it's listening on"""
         if self.running:
             return self.port
-            
+
+        # Bounded pool instead of a thread per client - caps runaway
+        # parallel tests and skips per-client thread startup cost
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="pjmock"
+        )
+
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind((self.host, self.port))
@@ -84,18 +123,30 @@ class MockProjectorServer:
         
         self.server_thread = threading.Thread(target=self._run_server, daemon=True)
         self.server_thread.start()
-        
+
+        # The listening socket is bound and queueing connections at this
+        # point - signal readiness so callers never need an arbitrary sleep
+        self._ready.set()
+
         return self.port
+
+    def wait_ready(self, timeout: float = 2.0) -> bool:
+        """Block until the server is accepting connections"""
+        return self._ready.wait(timeout)
     
     def stop(self):
         """Stop the mock server"""
         self.running = False
+        self._ready.clear()
         if self.socket:
             try:
                 self.socket.close()
             except:
                 pass
             self.socket = None
+        if self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
     
     def _run_server(self):
         """Main server loop"""
@@ -103,11 +154,11 @@ class MockProjectorServer:
             try:
                 self.socket.settimeout(1.0)
                 client_socket, address = self.socket.accept()
-                threading.Thread(
-                    target=self._handle_client,
-                    args=(client_socket, address),
-                    daemon=True
-                ).start()
+                pool = self._pool
+                if pool is None:
+                    client_socket.close()
+                    break
+                pool.submit(self._handle_client, client_socket, address)
             except socket.timeout:
                 continue
             except Exception as e:
@@ -120,22 +171,35 @@ class MockProjectorServer:
         try:
             # Send initial PJLink handshake message
             client_socket.sendall(self.initial_message.encode('ascii'))
-            
+
+            # Reusable receive buffer - avoids allocating a fresh bytes
+            # object for every read on chatty connections
+            recv_buffer = bytearray(1024)
+            recv_view = memoryview(recv_buffer)
+            pending = b""
+
             # Handle commands
             while self.running:
                 try:
                     client_socket.settimeout(1.0)
-                    data = client_socket.recv(1024)
-                    
-                    if not data:
+                    nbytes = client_socket.recv_into(recv_view)
+
+                    if not nbytes:
                         break
-                    
-                    command = data.decode('ascii', errors='ignore').strip()
-                    response = self._process_command(command)
-                    
-                    if response:
-                        client_socket.sendall(response.encode('ascii'))
-                        
+
+                    # Clients may pipeline several commands in one write;
+                    # answer each \r-terminated frame in order
+                    pending += recv_view[:nbytes].tobytes()
+                    while b"\r" in pending:
+                        frame, pending = pending.split(b"\r", 1)
+                        command = frame.decode('ascii', errors='ignore').strip()
+                        if not command:
+                            continue
+                        response = self._process_command(command)
+
+                        if response:
+                            client_socket.sendall(response.encode('ascii'))
+
                 except socket.timeout:
                     continue
                 except Exception as e:
@@ -152,58 +216,50 @@ class MockProjectorServer:
     def _process_command(self, command: str) -> Optional[str]:
         """Process a PJLink command and return response"""
         command = command.strip()
-        
+        state = self.state
+
+        # Status queries - answered from the memoized per-state table
+        table = _build_query_table(state.power, state.mute, state.freeze,
+                                   state.lamp_hours, state.input, state.error)
+        response = table.get(command)
+        if response:
+            return response + "\r"
+
         # Power commands
-        if command == "%1POWR ?":
-            return self.state.get_power_response() + "\r"
-        elif command == "%1POWR 1":
-            self.state.power = "ON"
+        if command == "%1POWR 1":
+            state.power = "ON"
             return "%1POWR=OK\r"
         elif command == "%1POWR 0":
-            self.state.power = "OFF"
+            state.power = "OFF"
             return "%1POWR=OK\r"
-        
+
         # Mute commands
-        elif command == "%1AVMT ?":
-            return self.state.get_mute_response() + "\r"
         elif command == "%1AVMT 30":
-            self.state.mute = "UNMUTED"
+            state.mute = "UNMUTED"
             return "%1AVMT=OK\r"
         elif command == "%1AVMT 31":
-            self.state.mute = "MUTED"
+            state.mute = "MUTED"
             return "%1AVMT=OK\r"
-        
+
         # Freeze commands
-        elif command == "%2FREZ ?":
-            return self.state.get_freeze_response() + "\r"
         elif command == "%2FREZ 1":
-            self.state.freeze = "FROZEN"
+            state.freeze = "FROZEN"
             return "%2FREZ=OK\r"
         elif command == "%2FREZ 0":
-            self.state.freeze = "NORMAL"
+            state.freeze = "NORMAL"
             return "%2FREZ=OK\r"
-        
-        # Lamp hours
-        elif command == "%1LAMP ?":
-            return self.state.get_lamp_response() + "\r"
-        
-        # Input status
-        elif command == "%1INPT ?":
-            return self.state.get_input_response() + "\r"
-        
-        # Error status
-        elif command == "%1ERST ?":
-            return self.state.get_error_response() + "\r"
-        
+
         # Unknown command
         else:
             return None
     
     def set_state(self, **kwargs):
-        """Update projector state"""
-        for key, value in kwargs.items():
-            if hasattr(self.state, key):
-                setattr(self.state, key, value)
+        """Update projector state (thread-safe: tests mutate a shared
+        server while client-handler threads are reading it)"""
+        with self._state_lock:
+            for key, value in kwargs.items():
+                if hasattr(self.state, key):
+                    setattr(self.state, key, value)
     
     def get_state(self) -> Dict:
         """Get current projector state"""
@@ -219,19 +275,22 @@ class MockProjectorServer:
 
 if __name__ == "__main__":
     # Test the mock server
+    import signal
+
     print("Starting mock projector server...")
     server = MockProjectorServer()
     port = server.start()
     print(f"Mock server running on 127.0.0.1:{port}")
     print("Press Ctrl+C to stop")
-    
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nStopping server...")
-        server.stop()
-        print("Server stopped")
+
+    # Sleep until interrupted instead of waking up every second
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *args: stop_event.set())
+    stop_event.wait()
+
+    print("\nStopping server...")
+    server.stop()
+    print("Server stopped")
 
 
 
@@ -7,8 +7,11 @@ import sys
 import os
 import logging
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports (skipped when already present,
+# e.g. when pytest's conftest.py has set it up for the whole session)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 from projector_control import ProjectorManager
 
 # Setup logging
@@ -4,13 +4,17 @@ Test connection to rear projector (10.10.10.4)
 Verifies PJLink connectivity and basic functionality
 """
 
+import asyncio
 import sys
 import os
 import socket
 import time
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports (skipped when already present,
+# e.g. when pytest's conftest.py has set it up for the whole session)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 from rear_projector_control import RearProjectorController
 
 def test_basic_connection():
@@ -35,51 +39,41 @@ def test_basic_connection():
         print(f"❌ Basic connection failed: {e}")
         return False
 
-def test_pjlink_commands():
-    """Test PJLink commands on rear projector"""
-    print("\nTesting PJLink commands on rear projector...")
-    
+async def _query_all_pjlink_statuses():
+    """Run all six PJLink status queries concurrently on one connection"""
     controller = RearProjectorController()
-    
+
     try:
-        # Test power status
-        print("Testing power status query...")
-        power_status = controller.get_power_status()
+        power_status, mute_status, freeze_status, lamp_hours, input_status, error_status = \
+            await asyncio.gather(
+                controller.get_power_status_async(),
+                controller.get_mute_status_async(),
+                controller.get_freeze_status_async(),
+                controller.get_lamp_hours_async(),
+                controller.get_input_status_async(),
+                controller.get_error_status_async()
+            )
+
         print(f"   Power status: {power_status or 'UNKNOWN'}")
-        
-        # Test mute status
-        print("Testing mute status query...")
-        mute_status = controller.get_mute_status()
         print(f"   Mute status: {mute_status or 'UNKNOWN'}")
-        
-        # Test freeze status
-        print("Testing freeze status query...")
-        freeze_status = controller.get_freeze_status()
         print(f"   Freeze status: {freeze_status or 'UNKNOWN'}")
-        
-        # Test lamp hours
-        print("Testing lamp hours query...")
-        lamp_hours = controller.get_lamp_hours()
         print(f"   Lamp hours: {lamp_hours or 'UNKNOWN'}")
-        
-        # Test input status
-        print("Testing input status query...")
-        input_status = controller.get_input_status()
         print(f"   Input status: {input_status or 'UNKNOWN'}")
-        
-        # Test error status
-        print("Testing error status query...")
-        error_status = controller.get_error_status()
         print(f"   Error status: {error_status or 'NONE'}")
-        
+
         print("✅ PJLink command testing completed!")
         return True
-        
+
     except Exception as e:
         print(f"❌ PJLink command testing failed: {e}")
         return False
     finally:
-        controller.disconnect()
+        await controller.disconnect_async()
+
+def test_pjlink_commands():
+    """Test PJLink commands on rear projector (queries gathered concurrently)"""
+    print("\nTesting PJLink commands on rear projector...")
+    return asyncio.run(_query_all_pjlink_statuses())
 
 def test_comprehensive_status():
     """Test comprehensive status retrieval"""
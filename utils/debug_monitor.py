@@ -4,19 +4,55 @@ Debug Monitor for Sony Projector Control System
 Provides real-time monitoring and debugging capabilities
 """
 
+import asyncio
+import re
 import time
 import threading
+import select
 import socket
 import sys
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Optional
 import json
 
+# readline gives input() in the interactive menu line editing and
+# up-arrow history for free; it isn't available on every platform
+try:
+    import readline  # noqa: F401
+except ImportError:
+    pass
+
+# orjson serializes large exports several times faster than the stdlib;
+# it's optional - exports fall back to json when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from projector_control import ProjectorManager
 
+# Status queries issued by every probe, prebuilt as bytes so the
+# diagnostic path does no dict construction or str.encode per call
+_PJLINK_CMDS = (
+    ('power_status', b'%1POWR ?\r'),
+    ('mute_status', b'%1AVMT ?\r'),
+    ('lamp_hours', b'%1LAMP ?\r'),
+    ('input_status', b'%1INPT ?\r'),
+    ('error_status', b'%1ERST ?\r'),
+)
+# The pipelined batch is constant too
+_PJLINK_CMD_BATCH = b''.join(cmd for _, cmd in _PJLINK_CMDS)
+
+# A well-formed reply to any of the queries above: class-1 header, the
+# four-letter command echoed back, then a payload. Compiled once.
+_PJLINK_OK_RE = re.compile(rb'^%1[A-Z]{4}=[^\r]+')
+
+
 class DebugMonitor:
     """Real-time debugging and monitoring for projector system"""
     
@@ -24,10 +60,35 @@ class DebugMonitor:
         self.projectors = projectors
         self.log_file = log_file
         self.manager = ProjectorManager(projectors)
+        # Resolved once - the monitor loop shouldn't pay a getattr plus a
+        # fallback-lambda allocation per projector per cycle
+        self._nickname_fn = getattr(self.manager, 'get_nickname_by_ip', None) or (lambda ip: None)
         self.running = False
         self.debug_data = {}
-        self.command_history = []
-        
+        # Background monitor launched from the interactive menu
+        self._monitor_thread = None
+        # Ring buffer of the last 100 commands - maxlen evicts the oldest
+        # entry in O(1) instead of a pop(0) shift on every log call
+        self.command_history = deque(maxlen=100)
+        # Persistent probe connections keyed by (ip, port): repeated
+        # diagnostics and monitor cycles reuse one session per projector
+        # instead of a TCP+PJLink handshake per probe. Each entry is
+        # (socket, greeting) so reuses still report the handshake result.
+        self._sock_pool = {}
+        # Full history streams to disk as compact JSON lines: the in-RAM
+        # deque only keeps the last 100 entries, but the .jsonl file holds
+        # the whole session and survives crashes
+        self._jsonl = open(self.log_file + ".jsonl", "a", buffering=1)
+        # Per-command log lines skip the logging machinery entirely: a
+        # buffered binary append avoids the record/format/handler-lock trip
+        # for every command while diagnostics hammer the projectors.
+        # self.logger stays for the infrequent user-facing messages.
+        self._cmd_log = open(self.log_file, "ab", buffering=8192)
+        # Diagnostics run per-projector on worker threads; serialize
+        # writes to the shared history/debug structures
+        self._history_lock = threading.Lock()
+
+
         # Setup logging
         self.setup_logging()
         
@@ -46,207 +107,392 @@ class DebugMonitor:
         
     def log_command(self, command: str, response: str, success: bool, projector_ip: str):
         """Log command execution details"""
-        timestamp = datetime.now().isoformat()
+        # Store the raw float timestamp - ISO/clock formatting happens
+        # lazily at display/export time, not per logged command
         entry = {
-            'timestamp': timestamp,
+            'ts': time.time(),
             'command': command,
             'response': response,
             'success': success,
             'projector_ip': projector_ip
         }
         
-        self.command_history.append(entry)
-        
-        # Keep only last 100 commands
-        if len(self.command_history) > 100:
-            self.command_history.pop(0)
-            
+        with self._history_lock:
+            self.command_history.append(entry)
+            self._jsonl.write(json.dumps(entry, separators=(',', ':')) + "\n")
+
+
         # Log to file
         status = "✅" if success else "❌"
-        self.logger.info(f"{status} {projector_ip}: {command.strip()} -> {response}")
+        self._cmd_log.write(
+            f"{status} {projector_ip}: {command.strip()} -> {response}\n".encode('utf-8')
+        )
         
-    def test_raw_connection(self, ip: str, port: int = 4352) -> Dict:
-        """Test raw network connection and PJLink handshake"""
+    @staticmethod
+    def _new_sock() -> socket.socket:
+        """Build a diagnostic socket tuned for tiny PJLink frames
+
+        TCP_NODELAY stops Nagle holding the <16-byte commands behind a
+        delayed ACK (up to ~40ms per frame); SO_KEEPALIVE lets the kernel
+        notice dead pooled connections between probes.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return sock
+
+    def _connect_probe_sock(self, ip: str, port: int, deadline: float):
+        """Dial a projector and read its PJLink greeting
+
+        Returns (socket, greeting). The socket is non-blocking; connect
+        completion is detected with select and SO_ERROR, and the greeting
+        is accumulated until its \\r arrives or the deadline passes.
+        """
+        sock = self._new_sock()
+        sock.setblocking(False)
+        if sock.connect_ex((ip, port)) != 0:
+            _, writable, _ = select.select(
+                [], [sock], [], max(deadline - time.monotonic(), 0))
+            if not writable:
+                sock.close()
+                raise TimeoutError("connection timed out")
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err:
+                sock.close()
+                raise OSError(err, os.strerror(err))
+
+        greeting = b""
+        while b'\r' not in greeting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+            chunk = sock.recv(1024)
+            if not chunk:
+                break
+            greeting += chunk
+
+        return sock, greeting.decode('ascii', errors='ignore').strip()
+
+    def _get_sock(self, ip: str, port: int, deadline: float):
+        """Return a pooled (socket, greeting) pair, reconnecting if dead"""
+        key = (ip, port)
+        entry = self._sock_pool.get(key)
+        if entry is not None:
+            sock = entry[0]
+            try:
+                # Peek without blocking: b'' means the peer closed; any
+                # stale bytes would desync response matching, so both
+                # cases get a fresh connection
+                if sock.recv(1, socket.MSG_PEEK) == b'':
+                    raise ConnectionError("connection closed by projector")
+                raise ConnectionError("unexpected data on idle connection")
+            except (BlockingIOError, InterruptedError):
+                return entry  # idle and alive
+            except Exception:
+                self._drop_sock(key)
+
+        entry = self._connect_probe_sock(ip, port, deadline)
+        self._sock_pool[key] = entry
+        return entry
+
+    def _drop_sock(self, key):
+        """Close and forget a pooled connection"""
+        entry = self._sock_pool.pop(key, None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except Exception:
+                pass
+
+    def _probe(self, ip: str, port: int = 4352) -> Dict:
+        """Run the connection check and command tests over one session
+
+        One connect and one greeting read cover both the raw-connection
+        test and all the status commands, instead of paying a TCP
+        handshake and PJLink handshake per test phase.
+        """
         results = {
             'network_ok': False,
             'pjlink_ok': False,
             'initial_message': None,
-            'error': None
+            'error': None,
+            'commands': {}
         }
-        
+
+        # One deadline governs the whole session: a silent or slow
+        # projector costs at most 10s total, never 10s per read
+        deadline = time.monotonic() + 10
+
         try:
-            # Test basic connection
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(10)
-            sock.connect((ip, port))
+            # Pooled connection - the handshake is only paid on the first
+            # probe of a projector (or after its connection dropped)
+            sock, greeting = self._get_sock(ip, port, deadline)
             results['network_ok'] = True
-            
-            # Test PJLink handshake
-            initial_msg = sock.recv(1024).decode('ascii', errors='ignore')
-            results['initial_message'] = initial_msg.strip()
-            
-            if initial_msg:
+            results['initial_message'] = greeting
+
+            if greeting:
                 results['pjlink_ok'] = True
-                
-            sock.close()
-            
-        except Exception as e:
-            results['error'] = str(e)
-            
-        return results
-        
-    def test_pjlink_commands(self, ip: str, port: int = 4352) -> Dict:
-        """Test various PJLink commands and responses"""
-        commands = {
-            'power_status': '%1POWR ?\r',
-            'mute_status': '%1AVMT ?\r',
-            'lamp_hours': '%1LAMP ?\r',
-            'input_status': '%1INPT ?\r',
-            'error_status': '%1ERST ?\r'
-        }
-        
-        results = {}
-        
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(10)
-            sock.connect((ip, port))
-            
-            # Read initial message
-            initial_msg = sock.recv(1024).decode('ascii', errors='ignore')
-            
-            for cmd_name, command in commands.items():
-                try:
-                    # Send command
-                    sock.sendall(command.encode('ascii'))
-                    
-                    # Receive response
-                    response = sock.recv(1024).decode('ascii', errors='ignore')
-                    
-                    results[cmd_name] = {
-                        'command': command.strip(),
-                        'response': response.strip(),
-                        'success': response.startswith('%1') or response == 'OK'
+
+            # Pipeline all the status commands in one write and drain the
+            # \r-terminated responses in order: one round-trip of latency
+            # instead of a send/recv ping-pong per command
+            select.select([], [sock], [], max(deadline - time.monotonic(), 0))
+            sock.sendall(_PJLINK_CMD_BATCH)
+
+            buf = b""
+            responses = []
+            while len(responses) < len(_PJLINK_CMDS):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                readable, _, _ = select.select([sock], [], [], remaining)
+                if not readable:
+                    break
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+                while b'\r' in buf and len(responses) < len(_PJLINK_CMDS):
+                    frame, buf = buf.split(b'\r', 1)
+                    responses.append(frame.strip())
+
+            # Responses come back in command order. Validation happens on
+            # the raw bytes; decoding is only paid for the display field.
+            for i, (cmd_name, command) in enumerate(_PJLINK_CMDS):
+                if i < len(responses):
+                    response = responses[i]
+                    results['commands'][cmd_name] = {
+                        'command': command.decode('ascii').strip(),
+                        'response': response.decode('ascii', errors='ignore'),
+                        'success': bool(_PJLINK_OK_RE.match(response)) or response == b'OK'
                     }
-                    
-                except Exception as e:
-                    results[cmd_name] = {
-                        'command': command.strip(),
-                        'response': f"Error: {e}",
+                else:
+                    results['commands'][cmd_name] = {
+                        'command': command.decode('ascii').strip(),
+                        'response': "Error: no response before deadline",
                         'success': False
                     }
-                    
-            sock.close()
-            
+
+            # An incomplete drain leaves the stream out of sync with the
+            # command order - retire the connection rather than reuse it
+            if len(responses) < len(_PJLINK_CMDS):
+                self._drop_sock((ip, port))
+
         except Exception as e:
             results['error'] = str(e)
-            
+            self._drop_sock((ip, port))
+
         return results
         
-    def monitor_projector_status(self, duration: int = 300):
-        """Monitor projector status continuously"""
-        print(f"🔍 Starting continuous monitoring for {duration} seconds...")
-        print("Press Ctrl+C to stop monitoring")
-        
-        start_time = time.time()
-        self.running = True
-        
+    async def _probe_async(self, ip: str, port: int) -> Dict:
+        """Query one projector's status over a short async session"""
+        info = {'power': None, 'mute': None, 'lamp_hours': None, 'online': False}
+
         try:
-            while self.running and (time.time() - start_time) < duration:
-                print("\n" + "="*60)
-                print(f"Status Check at {datetime.now().strftime('%H:%M:%S')}")
-                print("="*60)
-                
-                # Get status from manager
-                status = self.manager.get_all_status()
-                
-                for ip, info in status.items():
-                    nickname = getattr(self.manager, 'get_nickname_by_ip', lambda x: None)(ip)
-                    display_name = f"{nickname} ({ip})" if nickname else ip
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port), timeout=10)
+        except Exception:
+            return info
+
+        try:
+            # Greeting, then the three status queries pipelined
+            await asyncio.wait_for(reader.readuntil(b'\r'), timeout=10)
+            writer.write(b"%1POWR ?\r%1AVMT ?\r%1LAMP ?\r")
+            await writer.drain()
+
+            responses = []
+            for _ in range(3):
+                frame = await asyncio.wait_for(reader.readuntil(b'\r'), timeout=10)
+                responses.append(frame.decode('ascii', errors='ignore').strip())
+
+            power_map = {
+                "%1POWR=0": "OFF",
+                "%1POWR=1": "ON",
+                "%1POWR=2": "COOLING",
+                "%1POWR=3": "WARMING"
+            }
+            info['power'] = power_map.get(responses[0])
+            if responses[1] == "%1AVMT=31":
+                info['mute'] = "MUTED"
+            elif responses[1] == "%1AVMT=30":
+                info['mute'] = "UNMUTED"
+            if responses[2].startswith("%1LAMP="):
+                try:
+                    info['lamp_hours'] = int(responses[2].split()[1])
+                except (ValueError, IndexError):
+                    pass
+            info['online'] = info['power'] is not None
+
+        except Exception:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+        return info
+
+    async def _monitor_async(self, duration: int):
+        """Async monitoring loop: all projectors polled concurrently"""
+        start_time = time.monotonic()
+        self.running = True
+        # Last printed status per projector - unchanged rows are elided so
+        # a steady-state monitor prints one header line per cycle instead
+        # of re-rendering every projector every 30 seconds
+        last_status = {}
+
+        while self.running and (time.monotonic() - start_time) < duration:
+            print("\n" + "="*60)
+            print(f"Status Check at {datetime.now().strftime('%H:%M:%S')}")
+            print("="*60)
+
+            # One gather overlaps every projector's round-trips; wall time
+            # per cycle is the slowest projector, not the sum
+            infos = await asyncio.gather(
+                *[self._probe_async(ip, port) for ip, port in self.projectors])
+
+            for (ip, port), info in zip(self.projectors, infos):
+                key = f"{ip}:{port}"
+                status_sig = (info['power'], info['mute'],
+                              info['online'], info['lamp_hours'])
+                if last_status.get(key) != status_sig:
+                    last_status[key] = status_sig
+                    nickname = self._nickname_fn(ip)
+                    display_name = f"{nickname} ({key})" if nickname else key
                     print(f"\n{display_name}:")
                     print(f"  Power: {info['power'] or 'UNKNOWN'}")
                     print(f"  Mute: {info['mute'] or 'UNKNOWN'}")
                     print(f"  Online: {'Yes' if info['online'] else 'No'}")
                     print(f"  Lamp Hours: {info['lamp_hours'] or 'UNKNOWN'}")
-                    
-                    # Store debug data
-                    self.debug_data[ip] = {
+
+                # Store debug data
+                with self._history_lock:
+                    self.debug_data[key] = {
                         'last_check': datetime.now().isoformat(),
                         'status': info
                     }
-                    
-                # Wait before next check
-                time.sleep(30)  # Check every 30 seconds
-                
+
+            # Wait before next check
+            await asyncio.sleep(30)  # Check every 30 seconds
+
+    def monitor_projector_status(self, duration: int = 300):
+        """Monitor projector status continuously"""
+        print(f"🔍 Starting continuous monitoring for {duration} seconds...")
+        print("Press Ctrl+C to stop monitoring")
+
+        try:
+            asyncio.run(self._monitor_async(duration))
         except KeyboardInterrupt:
             print("\n🛑 Monitoring stopped by user")
         finally:
             self.running = False
             
+    def _diagnose_one(self, ip: str, port: int) -> Dict:
+        """Run the full diagnostic battery against one projector"""
+        results = {
+            'probe': self._probe(ip, port),
+            'manager': None,
+            'manager_error': None
+        }
+
+        # Manager integration - pointless if the raw probe couldn't even
+        # connect, and skipping it saves a second connect timeout per
+        # offline projector
+        if not results['probe']['network_ok']:
+            results['manager_error'] = "skipped: no network connection"
+            return results
+
+        try:
+            # Resolve by the full ip:port key - the bare-IP fallback would
+            # hand every worker the first controller on a shared IP
+            controller = self.manager.get_controller(f"{ip}:{port}")
+            with controller:
+                results['manager'] = {
+                    'power': controller.get_power_status(),
+                    'mute': controller.get_mute_status()
+                }
+        except Exception as e:
+            results['manager_error'] = str(e)
+
+        return results
+
     def run_diagnostic_test(self):
         """Run comprehensive diagnostic test"""
         print("🔧 Running Comprehensive Diagnostic Test")
         print("="*60)
-        
+
+        # Each projector's tests are pure I/O waiting - overlap them so a
+        # sweep takes roughly one projector's time instead of the sum
+        with ThreadPoolExecutor(max_workers=max(len(self.projectors), 1),
+                                thread_name_prefix="diag") as pool:
+            futures = {
+                pool.submit(self._diagnose_one, ip, port): (ip, port)
+                for ip, port in self.projectors
+            }
+            all_results = {futures[f]: f.result() for f in as_completed(futures)}
+
+        # Render in configured order once everything is in. Lines are
+        # collected per projector and flushed with one write each - a few
+        # dozen individual print() calls each take the stdout lock and may
+        # flush; one write per projector does it once.
         for ip, port in self.projectors:
-            print(f"\n📡 Testing {ip}:{port}")
-            print("-" * 40)
-            
+            results = all_results[(ip, port)]
+            raw_results = results['probe']
+
+            out = [f"\n📡 Testing {ip}:{port}", "-" * 40]
+
             # Test 1: Raw connection
-            print("1. Testing raw network connection...")
-            raw_results = self.test_raw_connection(ip, port)
-            
+            out.append("1. Testing raw network connection...")
             if raw_results['network_ok']:
-                print("   ✅ Network connection successful")
-                print(f"   📡 Initial message: {raw_results['initial_message']}")
-                
+                out.append("   ✅ Network connection successful")
+                out.append(f"   📡 Initial message: {raw_results['initial_message']}")
+
                 if raw_results['pjlink_ok']:
-                    print("   ✅ PJLink handshake successful")
+                    out.append("   ✅ PJLink handshake successful")
                 else:
-                    print("   ❌ PJLink handshake failed")
+                    out.append("   ❌ PJLink handshake failed")
             else:
-                print(f"   ❌ Network connection failed: {raw_results['error']}")
-                
-            # Test 2: PJLink commands (only if connection works)
-            if raw_results['network_ok']:
-                print("\n2. Testing PJLink commands...")
-                cmd_results = self.test_pjlink_commands(ip, port)
-                
-                for cmd_name, result in cmd_results.items():
-                    if cmd_name == 'error':
-                        print(f"   ❌ {cmd_name}: {result}")
-                    else:
-                        status = "✅" if result['success'] else "❌"
-                        print(f"   {status} {cmd_name}: {result['response']}")
-                        
+                out.append(f"   ❌ Network connection failed: {raw_results['error']}")
+
+            # Test 2: PJLink commands
+            if raw_results['commands']:
+                out.append("\n2. Testing PJLink commands...")
+                for cmd_name, result in raw_results['commands'].items():
+                    status = "✅" if result['success'] else "❌"
+                    out.append(f"   {status} {cmd_name}: {result['response']}")
+
             # Test 3: Manager integration
-            print("\n3. Testing manager integration...")
-            try:
-                with self.manager.controllers[ip]:
-                    power_status = self.manager.controllers[ip].get_power_status()
-                    mute_status = self.manager.controllers[ip].get_mute_status()
-                    
-                    print(f"   ✅ Power status: {power_status}")
-                    print(f"   ✅ Mute status: {mute_status}")
-                    
-            except Exception as e:
-                print(f"   ❌ Manager test failed: {e}")
-                
-            print("-" * 40)
+            out.append("\n3. Testing manager integration...")
+            if results['manager'] is not None:
+                out.append(f"   ✅ Power status: {results['manager']['power']}")
+                out.append(f"   ✅ Mute status: {results['manager']['mute']}")
+            else:
+                out.append(f"   ❌ Manager test failed: {results['manager_error']}")
+
+            out.append("-" * 40)
+            sys.stdout.write("\n".join(out) + "\n")
             
     def show_command_history(self, limit: int = 20):
         """Display recent command history"""
         print(f"\n📜 Recent Command History (last {limit} commands)")
         print("="*60)
         
-        recent_commands = self.command_history[-limit:] if self.command_history else []
+        # Snapshot under the lock - the background monitor and diagnostic
+        # workers append concurrently, and iterating a mutating deque raises
+        with self._history_lock:
+            recent_commands = list(self.command_history)[-limit:]
         
         if not recent_commands:
             print("No commands executed yet")
             return
             
         for entry in recent_commands:
-            timestamp = entry['timestamp'][11:19]  # Just time part
+            timestamp = time.strftime('%H:%M:%S', time.localtime(entry['ts']))
             status = "✅" if entry['success'] else "❌"
             print(f"{timestamp} {status} {entry['projector_ip']}: {entry['command']}")
             if not entry['success']:
@@ -254,20 +500,75 @@ class DebugMonitor:
                 
     def export_debug_data(self, filename: str = "debug_export.json"):
         """Export debug data to JSON file"""
+        # Snapshot both shared structures under the lock: the background
+        # monitor replaces debug_data entries and appends history while an
+        # export runs, and serializing a dict mid-mutation raises
+        with self._history_lock:
+            recent_commands = list(self.command_history)
+            debug_data = dict(self.debug_data)
+
+        # Expand the raw float timestamps to ISO strings only here
+        history = []
+        for entry in recent_commands:
+            item = dict(entry)
+            item['timestamp'] = datetime.fromtimestamp(item.pop('ts')).isoformat()
+            history.append(item)
+
         export_data = {
             'export_timestamp': datetime.now().isoformat(),
             'projectors': self.projectors,
-            'debug_data': self.debug_data,
-            'command_history': self.command_history
+            'debug_data': debug_data,
+            'command_history': history
         }
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(export_data, f, indent=2)
             print(f"✅ Debug data exported to {filename}")
         except Exception as e:
             print(f"❌ Failed to export debug data: {e}")
             
+    def _menu_monitor(self):
+        """Menu option 2: start monitoring on a background thread
+
+        Running the monitor loop on a daemon thread keeps the menu
+        responsive instead of blocking input() for the whole duration.
+        """
+        if self._monitor_thread is not None and self._monitor_thread.is_alive():
+            print("Monitoring is already running")
+            return
+
+        duration = input("Enter monitoring duration in seconds (default 300): ").strip()
+        try:
+            duration = int(duration) if duration else 300
+        except ValueError:
+            print("Invalid duration, using default 300 seconds")
+            duration = 300
+
+        self._monitor_thread = threading.Thread(
+            target=self.monitor_projector_status, args=(duration,), daemon=True)
+        self._monitor_thread.start()
+        print("✅ Monitoring started in the background - menu stays available")
+
+    def _menu_history(self):
+        """Menu option 3: show command history"""
+        limit = input("Enter number of commands to show (default 20): ").strip()
+        try:
+            limit = int(limit) if limit else 20
+            self.show_command_history(limit)
+        except ValueError:
+            self.show_command_history()
+
+    def _menu_export(self):
+        """Menu option 4: export debug data"""
+        filename = input("Enter export filename (default debug_export.json): ").strip()
+        filename = filename if filename else "debug_export.json"
+        self.export_debug_data(filename)
+
     def interactive_debug_mode(self):
         """Interactive debugging mode"""
         print("🔧 Interactive Debug Mode")
@@ -279,46 +580,30 @@ class DebugMonitor:
         print("4. Export debug data")
         print("5. Test specific projector")
         print("6. Exit")
-        
+
+        # O(1) dispatch instead of a string-compare chain per choice
+        dispatch = {
+            "1": self.run_diagnostic_test,
+            "2": self._menu_monitor,
+            "3": self._menu_history,
+            "4": self._menu_export,
+            "5": self.test_specific_projector,
+        }
+
         while True:
             try:
                 choice = input("\nEnter choice (1-6): ").strip()
-                
-                if choice == "1":
-                    self.run_diagnostic_test()
-                    
-                elif choice == "2":
-                    duration = input("Enter monitoring duration in seconds (default 300): ").strip()
-                    try:
-                        duration = int(duration) if duration else 300
-                        self.monitor_projector_status(duration)
-                    except ValueError:
-                        print("Invalid duration, using default 300 seconds")
-                        self.monitor_projector_status()
-                        
-                elif choice == "3":
-                    limit = input("Enter number of commands to show (default 20): ").strip()
-                    try:
-                        limit = int(limit) if limit else 20
-                        self.show_command_history(limit)
-                    except ValueError:
-                        self.show_command_history()
-                        
-                elif choice == "4":
-                    filename = input("Enter export filename (default debug_export.json): ").strip()
-                    filename = filename if filename else "debug_export.json"
-                    self.export_debug_data(filename)
-                    
-                elif choice == "5":
-                    self.test_specific_projector()
-                    
-                elif choice == "6":
+
+                if choice == "6":
                     print("Exiting debug mode...")
                     break
-                    
+
+                handler = dispatch.get(choice)
+                if handler is not None:
+                    handler()
                 else:
                     print("Invalid choice. Please try again.")
-                    
+
             except KeyboardInterrupt:
                 print("\nExiting debug mode...")
                 break
@@ -339,19 +624,17 @@ class DebugMonitor:
                 ip, port = self.projectors[projector_idx]
                 print(f"\nTesting {ip}:{port}")
                 
-                # Run tests
-                raw_results = self.test_raw_connection(ip, port)
-                cmd_results = self.test_pjlink_commands(ip, port)
-                
-                print(f"\nRaw connection: {'✅' if raw_results['network_ok'] else '❌'}")
-                print(f"PJLink: {'✅' if raw_results['pjlink_ok'] else '❌'}")
-                
-                if cmd_results:
+                # Run tests (single session)
+                probe_results = self._probe(ip, port)
+
+                print(f"\nRaw connection: {'✅' if probe_results['network_ok'] else '❌'}")
+                print(f"PJLink: {'✅' if probe_results['pjlink_ok'] else '❌'}")
+
+                if probe_results['commands']:
                     print("\nCommand responses:")
-                    for cmd_name, result in cmd_results.items():
-                        if cmd_name != 'error':
-                            status = "✅" if result['success'] else "❌"
-                            print(f"  {status} {cmd_name}: {result['response']}")
+                    for cmd_name, result in probe_results['commands'].items():
+                        status = "✅" if result['success'] else "❌"
+                        print(f"  {status} {cmd_name}: {result['response']}")
                             
             else:
                 print("Invalid projector number")
@@ -362,6 +645,16 @@ class DebugMonitor:
     def cleanup(self):
         """Cleanup resources"""
         self.running = False
+        for key in list(self._sock_pool):
+            self._drop_sock(key)
+        try:
+            self._jsonl.close()
+        except Exception:
+            pass
+        try:
+            self._cmd_log.close()
+        except Exception:
+            pass
         self.manager.close()
 
 def main():